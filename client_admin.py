@@ -1,60 +1,131 @@
 import socket
-import json
 import sys
-import getpass
 
-SERVER_HOST = '127.0.0.1'
-BUFFER_SIZE = 4096
+from client_common import (
+    SERVER_HOST, BUFFER_SIZE, SOCKET_BUFFER_SIZE,
+    send_request, request_courses, display_courses, cache_courses,
+)
+
+ADMIN_MENU = (
+    "\n--- Admin Menu ---\n"
+    "Commands:\n"
+    "  list courses          - Show all courses\n"
+    "  create course         - Add a new course\n"
+    "  update course         - Increase capacity of a course\n"
+    "  add student           - Add a new student\n"
+    "  logout                - Exit the application\n"
+    "> "
+)
+
+def handle_list_courses(sock, rfile, argument):
+    courses, response = request_courses(sock, rfile, 'list_courses_admin', 'courses')
+    if courses is not None:
+        display_courses(courses, "Current Course List")
+    elif response:
+        print(f"[Error] {response.get('message', 'Failed to list courses')}")
+
+def handle_create_course(sock, rfile, argument):
+    try:
+        name = input("Enter course name: ").strip()
+        schedule = input("Enter schedule (e.g., MWF 10:00-11:00): ").strip()
+        capacity_str = input("Enter maximum capacity: ").strip()
+        if not name or not schedule or not capacity_str:
+            print("All fields are required.")
+            return
+        if not capacity_str.isdecimal():
+            print("[Error] Invalid capacity. Please enter a number.")
+            return
+        capacity = int(capacity_str)
+        if capacity <= 0:
+            print("Capacity must be a positive number.")
+            return
+
+        response = send_request(sock, rfile, 'create_course', {
+            'name': name,
+            'schedule': schedule,
+            'capacity': capacity
+        })
+        if response:
+            print(f"[{response.get('status', 'error').upper()}] {response.get('message', 'No message received')}")
+            if response.get('status') == 'success':
+                courses = response.get('data', {}).get('courses', [])
+                cache_courses('list_courses_admin', courses)
+                display_courses(courses, "Updated Course List")
+
+    except Exception as e:
+        print(f"[Error] Could not create course: {e}")
 
-def send_request(sock, action, data=None):
-    request = {"action": action, "data": data or {}}
+def handle_update_course(sock, rfile, argument):
     try:
-        sock.sendall(json.dumps(request).encode('utf-8'))
-        response_data = sock.recv(BUFFER_SIZE)
-        if not response_data:
-            print("\n[Error] Connection lost with the server.")
-            return None
-        response = json.loads(response_data.decode('utf-8'))
-        return response
-    except (socket.error, json.JSONDecodeError, ConnectionResetError, BrokenPipeError) as e:
-        print(f"\n[Error] Communication error: {e}")
-        return None
+        name = input("Enter course name to update: ").strip()
+        new_capacity_str = input("Enter new (increased) capacity: ").strip()
+        if not name or not new_capacity_str:
+            print("Course name and new capacity are required.")
+            return
+        if not new_capacity_str.isdecimal():
+            print("[Error] Invalid capacity. Please enter a number.")
+            return
+        new_capacity = int(new_capacity_str)
+
+        response = send_request(sock, rfile, 'update_course', {
+            'name': name,
+            'capacity': new_capacity
+        })
+        if response:
+            print(f"[{response.get('status', 'error').upper()}] {response.get('message', 'No message received')}")
+            if response.get('status') == 'success':
+                courses = response.get('data', {}).get('courses', [])
+                cache_courses('list_courses_admin', courses)
+                display_courses(courses, "Updated Course List")
+
     except Exception as e:
-        print(f"\n[Error] An unexpected error occurred: {e}")
-        return None
-
-def display_courses(courses, title="Courses"):
-    print(f"\n--- {title} ---")
-    if not courses:
-        print("No courses to display.")
-        return
-
-    headers = ["Name", "Schedule", "Capacity", "Remaining Seats"]
-
-    col_widths = {header: len(header) for header in headers}
-    for course in courses:
-        col_widths["Name"] = max(col_widths["Name"], len(str(course.get('name', 'N/A'))))
-        col_widths["Schedule"] = max(col_widths["Schedule"], len(str(course.get('schedule', 'N/A'))))
-        col_widths["Capacity"] = max(col_widths["Capacity"], len(str(course.get('capacity', 'N/A'))))
-        col_widths["Remaining Seats"] = max(col_widths["Remaining Seats"], len(str(course.get('remaining_seats', 'N/A'))))
-
-    header_line = " | ".join(f"{h:<{col_widths[h]}}" for h in headers)
-    print(header_line)
-    print("-" * len(header_line))
-
-    for course in courses:
-        row_data = [
-            str(course.get('name', 'N/A')),
-            str(course.get('schedule', 'N/A')),
-            str(course.get('capacity', 'N/A')),
-            str(course.get('remaining_seats', 'N/A'))
-        ]
-        print(" | ".join(f"{row_data[i]:<{col_widths[h]}}" for i, h in enumerate(headers)))
-
-    print("-" * len(header_line))
+        print(f"[Error] Could not update course: {e}")
+
+def handle_add_student(sock, rfile, argument):
+    import getpass
+    try:
+        name = input("Enter student's full name: ").strip()
+        username = input("Enter student's username: ").strip()
+        password = getpass.getpass("Enter student's password: ")
+        confirm_password = getpass.getpass("Confirm student's password: ")
+
+        if not name or not username or not password:
+            print("Name, username, and password are required.")
+            return
+        if password != confirm_password:
+            print("[Error] Passwords do not match.")
+            return
+
+        response = send_request(sock, rfile, 'add_student', {
+            'name': name,
+            'username': username,
+            'password': password
+        })
+        if response:
+            print(f"[{response.get('status', 'error').upper()}] {response.get('message', 'No message received')}")
+
+    except Exception as e:
+        print(f"[Error] Could not add student: {e}")
+
+def handle_logout(sock, rfile, argument):
+    print("Logging out...")
+    send_request(sock, rfile, 'logout', expect_reply=False)
+    return True
+
+COMMANDS = {
+    ('list', 'courses'): handle_list_courses,
+    ('create', 'course'): handle_create_course,
+    ('update', 'course'): handle_update_course,
+    ('add', 'student'): handle_add_student,
+    'logout': handle_logout,
+}
 
 def main(port):
     client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE)
+    client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
 
     try:
         print(f"Connecting to server at {SERVER_HOST}:{port}...")
@@ -63,7 +134,9 @@ def main(port):
     except socket.error as e:
         print(f"[Error] Could not connect to server: {e}")
         sys.exit(1)
+    rfile = client_socket.makefile('rb', buffering=BUFFER_SIZE)
 
+    import getpass
     logged_in = False
     while not logged_in:
         username = input("Enter admin username: ")
@@ -73,9 +146,10 @@ def main(port):
             print("Username and password cannot be empty.")
             continue
 
-        response = send_request(client_socket, 'login_admin', {'username': username, 'password': password})
+        response = send_request(client_socket, rfile, 'login_admin', {'username': username, 'password': password})
 
         if response is None:
+            rfile.close()
             client_socket.close()
             sys.exit(1)
 
@@ -83,124 +157,30 @@ def main(port):
             print("\nAdmin login successful!")
             logged_in = True
             courses = response.get('data', {}).get('courses', [])
+            cache_courses('list_courses_admin', courses)
             display_courses(courses, "Current Course List")
         else:
             print(f"[Login Failed] {response.get('message', 'Unknown error')}")
             retry = input("Try again? (y/n): ").lower()
             if retry != 'y':
+                rfile.close()
                 client_socket.close()
                 sys.exit(0)
 
     while True:
-        print("\n--- Admin Menu ---")
-        print("Commands:")
-        print("  list courses          - Show all courses")
-        print("  create course         - Add a new course")
-        print("  update course         - Increase capacity of a course")
-        print("  add student           - Add a new student")
-        print("  logout                - Exit the application")
-
-        command_input = input("> ").strip().lower()
+        command_input = input(ADMIN_MENU).strip().lower()
         parts = command_input.split(maxsplit=1)
         command = parts[0] if parts else ""
         argument = parts[1] if len(parts) > 1 else None
 
-        if command == 'list' and argument == 'courses':
-            response = send_request(client_socket, 'list_courses_admin')
-            if response and response.get('status') == 'success':
-                display_courses(response.get('data', {}).get('courses', []), "Current Course List")
-            elif response:
-                print(f"[Error] {response.get('message', 'Failed to list courses')}")
-
-        elif command == 'create' and argument == 'course':
-            try:
-                name = input("Enter course name: ").strip()
-                schedule = input("Enter schedule (e.g., MWF 10:00-11:00): ").strip()
-                capacity_str = input("Enter maximum capacity: ").strip()
-                if not name or not schedule or not capacity_str:
-                    print("All fields are required.")
-                    continue
-                capacity = int(capacity_str)
-                if capacity <= 0:
-                    print("Capacity must be a positive number.")
-                    continue
-
-                response = send_request(client_socket, 'create_course', {
-                    'name': name,
-                    'schedule': schedule,
-                    'capacity': capacity
-                })
-                if response:
-                    print(f"[{response.get('status', 'error').upper()}] {response.get('message', 'No message received')}")
-                    if response.get('status') == 'success':
-                        list_resp = send_request(client_socket, 'list_courses_admin')
-                        if list_resp and list_resp.get('status') == 'success':
-                            display_courses(list_resp.get('data', {}).get('courses', []), "Updated Course List")
-
-            except ValueError:
-                print("[Error] Invalid capacity. Please enter a number.")
-            except Exception as e:
-                print(f"[Error] Could not create course: {e}")
-
-        elif command == 'update' and argument == 'course':
-            try:
-                name = input("Enter course name to update: ").strip()
-                new_capacity_str = input("Enter new (increased) capacity: ").strip()
-                if not name or not new_capacity_str:
-                    print("Course name and new capacity are required.")
-                    continue
-                new_capacity = int(new_capacity_str)
-
-                response = send_request(client_socket, 'update_course', {
-                    'name': name,
-                    'capacity': new_capacity
-                })
-                if response:
-                    print(f"[{response.get('status', 'error').upper()}] {response.get('message', 'No message received')}")
-                    if response.get('status') == 'success':
-                        list_resp = send_request(client_socket, 'list_courses_admin')
-                        if list_resp and list_resp.get('status') == 'success':
-                            display_courses(list_resp.get('data', {}).get('courses', []), "Updated Course List")
-
-            except ValueError:
-                print("[Error] Invalid capacity. Please enter a number.")
-            except Exception as e:
-                print(f"[Error] Could not update course: {e}")
-
-        elif command == 'add' and argument == 'student':
-            try:
-                name = input("Enter student's full name: ").strip()
-                username = input("Enter student's username: ").strip()
-                password = getpass.getpass("Enter student's password: ")
-                confirm_password = getpass.getpass("Confirm student's password: ")
-
-                if not name or not username or not password:
-                    print("Name, username, and password are required.")
-                    continue
-                if password != confirm_password:
-                    print("[Error] Passwords do not match.")
-                    continue
-
-                response = send_request(client_socket, 'add_student', {
-                    'name': name,
-                    'username': username,
-                    'password': password
-                })
-                if response:
-                    print(f"[{response.get('status', 'error').upper()}] {response.get('message', 'No message received')}")
-
-            except Exception as e:
-                print(f"[Error] Could not add student: {e}")
-
-        elif command == 'logout':
-            print("Logging out...")
-            send_request(client_socket, 'logout')
-            break
-
-        else:
+        handler = COMMANDS.get((command, argument)) or COMMANDS.get(command)
+        if handler is None:
             print("Invalid command. Please use one of the commands listed above.")
+        elif handler(client_socket, rfile, argument):
+            break
 
     print("Closing connection.")
+    rfile.close()
     client_socket.close()
     sys.exit(0)
 
@@ -218,3 +198,6 @@ if __name__ == "__main__":
     except KeyboardInterrupt:
         print("\nExiting...")
         sys.exit(0)
+    except Exception as e:
+        print(f"\n[Error] An unexpected error occurred: {e}")
+        sys.exit(1)
@@ -0,0 +1,131 @@
+import socket
+import json
+import struct
+import sys
+import time
+
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+    _loads = json.loads
+
+SERVER_HOST = '127.0.0.1'
+BUFFER_SIZE = 64 * 1024
+SOCKET_BUFFER_SIZE = 64 * 1024
+COURSE_CACHE_TTL = 2.0
+
+_last_courses = {}
+
+def cached_courses(action):
+    entry = _last_courses.get(action)
+    if entry and time.monotonic() - entry[0] < COURSE_CACHE_TTL:
+        return entry[1]
+    return None
+
+def cache_courses(action, courses, version=None):
+    _last_courses[action] = (time.monotonic(), courses, version)
+
+_pack_length = struct.Struct('>I').pack
+
+def frame(body):
+    return _pack_length(len(body)) + body
+
+def send_framed(sock, body):
+    header = _pack_length(len(body))
+    if not hasattr(sock, 'sendmsg'):
+        sock.sendall(header + body)
+        return
+    buffers = [memoryview(header), memoryview(body)]
+    while buffers:
+        sent = sock.sendmsg(buffers)
+        while buffers and sent >= len(buffers[0]):
+            sent -= len(buffers.pop(0))
+        if buffers and sent:
+            buffers[0] = buffers[0][sent:]
+
+_PRECOMPUTED_REQUESTS = {
+    action: frame(_dumps({"action": action, "data": {}}))
+    for action in ('list_courses_admin', 'list_courses_student', 'my_courses', 'logout')
+}
+
+def recv_framed(rfile):
+    header = rfile.read(4)
+    if len(header) < 4:
+        return None
+    length = int.from_bytes(header, 'big')
+    body = rfile.read(length)
+    if len(body) < length:
+        return None
+    return body
+
+def send_request(sock, rfile, action, data=None, expect_reply=True):
+    try:
+        request_frame = None if data else _PRECOMPUTED_REQUESTS.get(action)
+        if request_frame is None:
+            send_framed(sock, _dumps({"action": action, "data": data or {}}))
+        else:
+            sock.sendall(request_frame)
+        if not expect_reply:
+            return None
+        response_data = recv_framed(rfile)
+        if response_data is None:
+            print("\n[Error] Connection lost with the server.")
+            return None
+        response = _loads(response_data)
+        return response
+    except (socket.error, json.JSONDecodeError, ConnectionResetError, BrokenPipeError) as e:
+        print(f"\n[Error] Communication error: {e}")
+        return None
+
+def request_courses(sock, rfile, action, key):
+    courses = cached_courses(action)
+    if courses is not None:
+        return courses, None
+    entry = _last_courses.get(action)
+    since = entry[2] if entry else None
+    response = send_request(sock, rfile, action, None if since is None else {'since': since})
+    if not response or response.get('status') != 'success':
+        return None, response
+    data = response.get('data', {})
+    courses = entry[1] if data.get('unchanged') else data.get(key, [])
+    cache_courses(action, courses, data.get('version'))
+    return courses, response
+
+def display_courses(courses, title="Courses"):
+    print(f"\n--- {title} ---")
+    if not courses:
+        print("No courses to display.")
+        return
+
+    headers = ["Name", "Schedule", "Capacity"]
+    show_remaining = 'remaining_seats' in courses[0]
+    if show_remaining:
+        headers.append("Remaining Seats")
+
+    widths = [len(header) for header in headers]
+    rows = []
+    for course in courses:
+        capacity = course.get('capacity')
+        row = [
+            course.get('name') or 'N/A',
+            course.get('schedule') or 'N/A',
+            'N/A' if capacity is None else str(capacity),
+        ]
+        if show_remaining:
+            remaining = course.get('remaining_seats')
+            row.append('N/A' if remaining is None else str(remaining))
+        rows.append(row)
+        for i, cell in enumerate(row):
+            widths[i] = max(widths[i], len(cell))
+
+    separator = "-" * (sum(widths) + 3 * (len(widths) - 1))
+
+    lines = [" | ".join(h.ljust(w) for h, w in zip(headers, widths)), separator]
+    for row in rows:
+        lines.append(" | ".join(cell.ljust(w) for cell, w in zip(row, widths)))
+    lines.append(separator)
+    sys.stdout.write("\n".join(lines) + "\n")
@@ -1,65 +1,77 @@
 import socket
-import json
 import sys
-import getpass
 
-SERVER_HOST = '127.0.0.1'
-BUFFER_SIZE = 4096
-
-def send_request(sock, action, data=None):
-    request = {"action": action, "data": data or {}}
-    try:
-        sock.sendall(json.dumps(request).encode('utf-8'))
-        response_data = sock.recv(BUFFER_SIZE)
-        if not response_data:
-            print("\n[Error] Connection lost with the server.")
-            return None
-        response = json.loads(response_data.decode('utf-8'))
-        return response
-    except (socket.error, json.JSONDecodeError, ConnectionResetError, BrokenPipeError) as e:
-        print(f"\n[Error] Communication error: {e}")
-        return None
-    except Exception as e:
-        print(f"\n[Error] An unexpected error occurred: {e}")
-        return None
-
-def display_courses(courses, title="Courses"):
-    print(f"\n--- {title} ---")
-    if not courses:
-        print("No courses to display.")
+from client_common import (
+    SERVER_HOST, BUFFER_SIZE, SOCKET_BUFFER_SIZE,
+    send_request, request_courses, display_courses, cache_courses,
+)
+
+STUDENT_MENU = (
+    "\n--- Student Menu ---\n"
+    "Commands:\n"
+    "  list courses          - Show available courses\n"
+    "  my courses            - Show your registered courses\n"
+    "  register <course_name> - Register for a course\n"
+    "  withdraw <course_name> - Withdraw from a course\n"
+    "  logout                - Exit the application\n"
+    "> "
+)
+
+def handle_list_courses(sock, rfile, argument):
+    courses, response = request_courses(sock, rfile, 'list_courses_student', 'courses')
+    if courses is not None:
+        display_courses(courses, "Available Courses")
+    elif response:
+        print(f"[Error] {response.get('message', 'Failed to list courses')}")
+
+def handle_my_courses(sock, rfile, argument):
+    registered_courses, response = request_courses(sock, rfile, 'my_courses', 'registered_courses')
+    if registered_courses is not None:
+        display_courses(registered_courses, "Your Registered Courses")
+    elif response:
+        print(f"[Error] {response.get('message', 'Failed to fetch registered courses')}")
+
+def show_registration_result(response):
+    if response:
+        print(f"[{response.get('status', 'error').upper()}] {response.get('message', 'No message received')}")
+        if response.get('status') == 'success':
+            data = response.get('data', {})
+            registered_courses = data.get('registered_courses', [])
+            cache_courses('my_courses', registered_courses)
+            cache_courses('list_courses_student', data.get('courses', []))
+            display_courses(registered_courses, "Updated Registered Courses")
+
+def handle_register(sock, rfile, argument):
+    if not argument:
+        print("Usage: register <course_name>")
         return
+    show_registration_result(send_request(sock, rfile, 'register_course', {'course_name': argument}))
 
-    headers = ["Name", "Schedule", "Capacity"]
-    if courses and 'remaining_seats' in courses[0]:
-        headers.append("Remaining Seats")
-
-    col_widths = {header: len(header) for header in headers}
-    for course in courses:
-        col_widths["Name"] = max(col_widths["Name"], len(str(course.get('name', 'N/A'))))
-        col_widths["Schedule"] = max(col_widths["Schedule"], len(str(course.get('schedule', 'N/A'))))
-        col_widths["Capacity"] = max(col_widths["Capacity"], len(str(course.get('capacity', 'N/A'))))
-        if "Remaining Seats" in headers:
-            col_widths["Remaining Seats"] = max(col_widths["Remaining Seats"], len(str(course.get('remaining_seats', 'N/A'))))
-
-    header_line = " | ".join(f"{h:<{col_widths[h]}}" for h in headers)
-    print(header_line)
-    print("-" * len(header_line))
-
-    for course in courses:
-        row_data = [
-            str(course.get('name', 'N/A')),
-            str(course.get('schedule', 'N/A')),
-            str(course.get('capacity', 'N/A'))
-        ]
-        if "Remaining Seats" in headers:
-            row_data.append(str(course.get('remaining_seats', 'N/A')))
+def handle_withdraw(sock, rfile, argument):
+    if not argument:
+        print("Usage: withdraw <course_name>")
+        return
+    show_registration_result(send_request(sock, rfile, 'withdraw_course', {'course_name': argument}))
 
-        print(" | ".join(f"{row_data[i]:<{col_widths[h]}}" for i, h in enumerate(headers)))
+def handle_logout(sock, rfile, argument):
+    print("Logging out...")
+    send_request(sock, rfile, 'logout', expect_reply=False)
+    return True
 
-    print("-" * len(header_line))
+COMMANDS = {
+    ('list', 'courses'): handle_list_courses,
+    ('my', 'courses'): handle_my_courses,
+    'register': handle_register,
+    'withdraw': handle_withdraw,
+    'logout': handle_logout,
+}
 
 def main(port):
     client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE)
+    client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
 
     try:
         print(f"Connecting to server at {SERVER_HOST}:{port}...")
@@ -68,7 +80,9 @@ def main(port):
     except socket.error as e:
         print(f"[Error] Could not connect to server: {e}")
         sys.exit(1)
+    rfile = client_socket.makefile('rb', buffering=BUFFER_SIZE)
 
+    import getpass
     logged_in = False
     while not logged_in:
         username = input("Enter username: ")
@@ -78,9 +92,10 @@ def main(port):
             print("Username and password cannot be empty.")
             continue
 
-        response = send_request(client_socket, 'login_student', {'username': username, 'password': password})
+        response = send_request(client_socket, rfile, 'login_student', {'username': username, 'password': password})
 
         if response is None:
+            rfile.close()
             client_socket.close()
             sys.exit(1)
 
@@ -88,6 +103,7 @@ def main(port):
             print("\nLogin successful!")
             logged_in = True
             registered_courses = response.get('data', {}).get('registered_courses', [])
+            cache_courses('my_courses', registered_courses)
             if registered_courses:
                 display_courses(registered_courses, "Your Registered Courses")
             else:
@@ -96,70 +112,24 @@ def main(port):
             print(f"[Login Failed] {response.get('message', 'Unknown error')}")
             retry = input("Try again? (y/n): ").lower()
             if retry != 'y':
+                rfile.close()
                 client_socket.close()
                 sys.exit(0)
 
     while True:
-        print("\n--- Student Menu ---")
-        print("Commands:")
-        print("  list courses          - Show available courses")
-        print("  my courses            - Show your registered courses")
-        print("  register <course_name> - Register for a course")
-        print("  withdraw <course_name> - Withdraw from a course")
-        print("  logout                - Exit the application")
-
-        command_input = input("> ").strip()
+        command_input = input(STUDENT_MENU).strip()
         parts = command_input.split(maxsplit=1)
         command = parts[0] if parts else ""
         argument = parts[1] if len(parts) > 1 else None
 
-        if command == 'list' and argument == 'courses':
-            response = send_request(client_socket, 'list_courses_student')
-            if response and response.get('status') == 'success':
-                display_courses(response.get('data', {}).get('courses', []), "Available Courses")
-            elif response:
-                print(f"[Error] {response.get('message', 'Failed to list courses')}")
-
-        elif command == 'my' and argument == 'courses':
-            response = send_request(client_socket, 'my_courses')
-            if response and response.get('status') == 'success':
-                display_courses(response.get('data', {}).get('registered_courses', []), "Your Registered Courses")
-            elif response:
-                print(f"[Error] {response.get('message', 'Failed to fetch registered courses')}")
-
-        elif command == 'register':
-            if not argument:
-                print("Usage: register <course_name>")
-                continue
-            response = send_request(client_socket, 'register_course', {'course_name': argument})
-            if response:
-                print(f"[{response.get('status', 'error').upper()}] {response.get('message', 'No message received')}")
-                if response.get('status') == 'success':
-                    my_courses_resp = send_request(client_socket, 'my_courses')
-                    if my_courses_resp and my_courses_resp.get('status') == 'success':
-                        display_courses(my_courses_resp.get('data', {}).get('registered_courses', []), "Updated Registered Courses")
-
-        elif command == 'withdraw':
-            if not argument:
-                print("Usage: withdraw <course_name>")
-                continue
-            response = send_request(client_socket, 'withdraw_course', {'course_name': argument})
-            if response:
-                print(f"[{response.get('status', 'error').upper()}] {response.get('message', 'No message received')}")
-                if response.get('status') == 'success':
-                    my_courses_resp = send_request(client_socket, 'my_courses')
-                    if my_courses_resp and my_courses_resp.get('status') == 'success':
-                        display_courses(my_courses_resp.get('data', {}).get('registered_courses', []), "Updated Registered Courses")
-
-        elif command == 'logout':
-            print("Logging out...")
-            send_request(client_socket, 'logout')
-            break
-
-        else:
+        handler = COMMANDS.get((command, argument)) or COMMANDS.get(command)
+        if handler is None:
             print("Invalid command. Please use one of the commands listed above.")
+        elif handler(client_socket, rfile, argument):
+            break
 
     print("Closing connection.")
+    rfile.close()
     client_socket.close()
     sys.exit(0)
 
@@ -177,3 +147,6 @@ if __name__ == "__main__":
     except KeyboardInterrupt:
         print("\nExiting...")
         sys.exit(0)
+    except Exception as e:
+        print(f"\n[Error] An unexpected error occurred: {e}")
+        sys.exit(1)
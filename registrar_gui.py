@@ -1,13 +1,64 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog, Toplevel
+from tkinter import ttk, messagebox
+import tkinter.font as tkfont
+import os
 import socket
 import json
-import sys
+import struct
 import threading
 import queue
+import itertools
+import selectors
+
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+    def _loads(data):
+        return json.loads(bytes(data))
 
 SERVER_HOST = '127.0.0.1'
-BUFFER_SIZE = 4096
+MAX_PENDING = 16
+LIST_ACTIONS = frozenset(('list_courses_student', 'list_courses_admin', 'my_courses'))
+RECV_BUFFER_SIZE = 64 * 1024
+SOCKET_BUFFER_SIZE = 256 * 1024
+
+_NET_ERRORS = (socket.error, ConnectionResetError, BrokenPipeError)
+
+_length_struct = struct.Struct('>I')
+_pack_length = _length_struct.pack
+_unpack_length = _length_struct.unpack_from
+
+_REQUEST_PREFIXES = {
+    action: b',"action":' + _dumps(action) + b',"data":'
+    for action in (
+        'login_student', 'login_admin', 'logout',
+        'list_courses_student', 'my_courses', 'register_course', 'withdraw_course',
+        'list_courses_admin', 'create_course', 'update_course', 'add_student',
+    )
+}
+
+def _encode_request(req_id, action, data):
+    prefix = _REQUEST_PREFIXES.get(action)
+    if prefix is None:
+        prefix = _REQUEST_PREFIXES[action] = b',"action":' + _dumps(action) + b',"data":'
+    return b'{"id":%d%s%s}' % (req_id, prefix, _dumps(data) if data else b'{}')
+
+class _WakingQueue(queue.Queue):
+    def __init__(self):
+        super().__init__()
+        self.wakeup_fd = None
+
+    def put(self, item, block=True, timeout=None):
+        super().put(item, block, timeout)
+        if self.wakeup_fd is not None:
+            try:
+                os.write(self.wakeup_fd, b'x')
+            except OSError:
+                pass
 
 class NetworkClient:
     def __init__(self, host, port, output_queue):
@@ -15,21 +66,44 @@ class NetworkClient:
         self.port = port
         self.output_queue = output_queue
         self.sock = None
+        self._sock_lock = threading.Lock()
         self.is_connected = False
-        self.request_queue = queue.Queue()
+        self.request_queue = queue.SimpleQueue()
         self.network_thread = None
+        self._wake_r = None
+        self._wake_w = None
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._inflight = {}
+        self._list_cache = {}
+        self._state_lock = threading.Lock()
         self.stop_event = threading.Event()
+        self._recv_buf = bytearray(RECV_BUFFER_SIZE)
+        self._recv_view = memoryview(self._recv_buf)
+        self._recv_start = 0
+        self._recv_end = 0
+
+    def start(self):
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self.network_thread = threading.Thread(target=self._run, daemon=True)
+        self.network_thread.start()
+
+    def _run(self):
+        if self.connect():
+            self._io_loop(self.sock)
+        self._close_wakeup()
 
     def connect(self):
         try:
             self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.tune_socket()
             self.sock.settimeout(5.0)
             self.sock.connect((self.host, self.port))
             self.sock.settimeout(None)
             self.is_connected = True
             self.stop_event.clear()
-            self.network_thread = threading.Thread(target=self._listen_for_requests, daemon=True)
-            self.network_thread.start()
             self.output_queue.put({"type": "connection_status", "status": "success", "message": f"Connected to {self.host}:{self.port}"})
             return True
         except socket.timeout:
@@ -45,70 +119,243 @@ class NetworkClient:
             self.output_queue.put({"type": "connection_status", "status": "error", "message": f"An unexpected error occurred during connection: {e}"})
             return False
 
+    def tune_socket(self):
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
+
+    def is_alive(self):
+        if not self.is_connected or not self.network_thread or not self.network_thread.is_alive():
+            return False
+        if not hasattr(socket, 'MSG_DONTWAIT'):
+            return True
+        with self._sock_lock:
+            sock = self.sock
+            if sock is None:
+                return False
+            try:
+                return sock.recv(1, socket.MSG_PEEK | socket.MSG_DONTWAIT) != b''
+            except BlockingIOError:
+                return True
+            except OSError:
+                return False
+
     def send_request(self, action, data=None):
         if not self.is_connected or not self.network_thread or not self.network_thread.is_alive():
             self.output_queue.put({"type": "error", "status": "error", "message": "Not connected to server."})
             return
-        request = {"action": action, "data": data or {}}
-        self.request_queue.put(request)
+        deduped = action in LIST_ACTIONS and not data
+        req_id = None
+        busy = False
+        with self._state_lock:
+            cached = self._list_cache.get(action) if deduped else None
+            if deduped and action in self._inflight:
+                pass
+            elif len(self._pending) >= MAX_PENDING:
+                busy = True
+            else:
+                req_id = next(self._ids)
+                self._pending[req_id] = action
+                if deduped:
+                    self._inflight[action] = req_id
+                else:
+                    self._inflight.clear()
+                    self._list_cache.clear()
+        if cached is not None:
+            self.output_queue.put({"type": "server_response", "action": action, "response": cached, "cached": True})
+            version = cached.get('data', {}).get('version')
+            if version is not None:
+                data = {'since': version}
+        if busy:
+            self.output_queue.put({"type": "error", "status": "error", "message": "Server busy, please wait."})
+        if req_id is None:
+            return
+        payload = _encode_request(req_id, action, data)
+        self.request_queue.put((_pack_length(len(payload)), payload))
+        self._wake()
 
-    def _listen_for_requests(self):
-        while not self.stop_event.is_set() and self.is_connected:
-            try:
-                request = self.request_queue.get(timeout=0.1)
-                if request is None:
-                    break
-                self.sock.sendall(json.dumps(request).encode('utf-8'))
-                response_data = self.sock.recv(BUFFER_SIZE)
-                if not response_data:
-                    self.is_connected = False
-                    self.output_queue.put({"type": "connection_status", "status": "error", "message": "Connection lost with server."})
-                    break
-                response = json.loads(response_data.decode('utf-8'))
-                self.output_queue.put({"type": "server_response", "action": request['action'], "response": response})
-            except queue.Empty:
-                continue
-            except (socket.error, json.JSONDecodeError, ConnectionResetError, BrokenPipeError) as e:
-                self.is_connected = False
+    def _wake(self):
+        try:
+            self._wake_w.send(b'x')
+        except (AttributeError, OSError):
+            pass
+
+    def _io_loop(self, sock):
+        sock.setblocking(False)
+        sel = selectors.DefaultSelector()
+        sel.register(sock, selectors.EVENT_READ)
+        sel.register(self._wake_r, selectors.EVENT_READ)
+        events = selectors.EVENT_READ
+        out = []
+        running = True
+        try:
+            while running:
+                for key, mask in sel.select():
+                    if key.fileobj is self._wake_r:
+                        running = self._take_requests(out)
+                    elif mask & selectors.EVENT_READ:
+                        running = self._read_responses(sock)
+                    if not running:
+                        break
+                if running and out:
+                    self._flush(sock, out)
+                wanted = selectors.EVENT_READ | selectors.EVENT_WRITE if out else selectors.EVENT_READ
+                if running and wanted != events:
+                    sel.modify(sock, wanted)
+                    events = wanted
+        except _NET_ERRORS as e:
+            if not self.stop_event.is_set():
                 self.output_queue.put({"type": "connection_status", "status": "error", "message": f"Communication error: {e}"})
-                break
-            except Exception as e:
-                self.is_connected = False
+        except Exception as e:
+            if not self.stop_event.is_set():
                 self.output_queue.put({"type": "error", "status": "error", "message": f"Network thread error: {e}"})
-                break
-        self._close_socket()
+        finally:
+            sel.close()
         self.is_connected = False
+        self._close_socket()
         if not self.stop_event.is_set():
             self.output_queue.put({"type": "connection_status", "status": "disconnected", "message": "Disconnected."})
         print("Network thread finished.")
 
+    def _take_requests(self, out):
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+        req_get_nowait = self.request_queue.get_nowait
+        while True:
+            try:
+                frame = req_get_nowait()
+            except queue.Empty:
+                return True
+            if frame is None:
+                return False
+            out.extend(memoryview(buffer) for buffer in frame)
+
+    def _flush(self, sock, out):
+        try:
+            if hasattr(sock, 'sendmsg'):
+                sent = sock.sendmsg(out)
+            else:
+                sent = sock.send(out[0])
+        except BlockingIOError:
+            return
+        while out and sent >= len(out[0]):
+            sent -= len(out.pop(0))
+        if out and sent:
+            out[0] = out[0][sent:]
+
+    def _read_responses(self, sock):
+        if self._recv_end == len(self._recv_buf):
+            self._make_room(0)
+        try:
+            count = sock.recv_into(self._recv_view[self._recv_end:])
+        except BlockingIOError:
+            return True
+        if not count:
+            if not self.stop_event.is_set():
+                self.output_queue.put({"type": "connection_status", "status": "error", "message": "Connection lost with server."})
+            return False
+        self._recv_end += count
+        loads = _loads
+        state_lock = self._state_lock
+        pending_pop = self._pending.pop
+        out_put = self.output_queue.put
+        while True:
+            response_data = self._next_frame()
+            if response_data is None:
+                return True
+            try:
+                response = loads(response_data)
+                if not isinstance(response, dict):
+                    raise ValueError(f"expected a JSON object, got {type(response).__name__}")
+            except ValueError as e:
+                out_put({"type": "error", "status": "error", "message": f"Malformed response from server: {e}"})
+                continue
+            req_id = response.pop('id', None)
+            if req_id is None and response.get('status') == 'error':
+                with state_lock:
+                    self._pending.clear()
+                    self._inflight.clear()
+                out_put({"type": "error", "status": "error", "message": response.get('message', "Request failed.")})
+                continue
+            data = response.get('data')
+            unchanged = isinstance(data, dict) and data.get('unchanged')
+            with state_lock:
+                action = pending_pop(req_id, None)
+                if self._inflight.get(action) == req_id:
+                    self._inflight.pop(action, None)
+                    if response.get('status') == 'success' and not unchanged:
+                        self._list_cache[action] = response
+            if unchanged:
+                continue
+            out_put({"type": "server_response", "action": action, "response": response})
+            if action == 'logout' and response.get('status') == 'success':
+                self.stop_event.set()
+                return False
+
+    def _next_frame(self):
+        available = self._recv_end - self._recv_start
+        if available < 4:
+            return None
+        (length,) = _unpack_length(self._recv_buf, self._recv_start)
+        if available < 4 + length:
+            if self._recv_start + 4 + length > len(self._recv_buf):
+                self._make_room(4 + length)
+            return None
+        start = self._recv_start + 4
+        end = start + length
+        if end == self._recv_end:
+            self._recv_start = self._recv_end = 0
+        else:
+            self._recv_start = end
+        return self._recv_view[start:end]
+
+    def _make_room(self, needed):
+        available = self._recv_end - self._recv_start
+        size = len(self._recv_buf)
+        if max(needed, available) >= size:
+            buf = bytearray(max(needed, 2 * size))
+            buf[:available] = self._recv_buf[self._recv_start:self._recv_end]
+            self._recv_buf = buf
+            self._recv_view = memoryview(buf)
+        else:
+            self._recv_buf[:available] = self._recv_buf[self._recv_start:self._recv_end]
+        self._recv_start = 0
+        self._recv_end = available
+
     def disconnect(self):
+        self.stop_event.set()
+        self.request_queue.put(None)
+        self._wake()
         if self.network_thread and self.network_thread.is_alive():
-            self.stop_event.set()
-            try:
-                self.request_queue.put_nowait(None)
-            except queue.Full:
-                pass
             self.network_thread.join(timeout=1.0)
         self._close_socket()
         self.is_connected = False
         print("Disconnected.")
 
+    def _close_wakeup(self):
+        for wake_sock in (self._wake_r, self._wake_w):
+            if wake_sock:
+                wake_sock.close()
+
     def _close_socket(self):
-        if self.sock:
+        with self._sock_lock:
+            sock, self.sock = self.sock, None
+        if sock:
             try:
-                self.sock.shutdown(socket.SHUT_RDWR)
+                sock.shutdown(socket.SHUT_RDWR)
             except OSError:
                 pass
             except Exception as e:
                 print(f"Error during socket shutdown: {e}")
             finally:
                 try:
-                    self.sock.close()
+                    sock.close()
                 except Exception as e:
                     print(f"Error during socket close: {e}")
-                finally:
-                    self.sock = None
 
 class RegistrarApp(tk.Tk):
     def __init__(self):
@@ -119,15 +366,21 @@ class RegistrarApp(tk.Tk):
         self.style = ttk.Style(self)
         self.style.theme_use('clam')
         self.configure(bg='#e0e0e0')
+        self._configure_styles()
         self.network_client = None
         self.user_type = None
         self.username = None
         self.is_logged_in = False
-        self.response_queue = queue.Queue()
+        self.response_queue = _WakingQueue()
+        self._wakeup_r = None
+        if hasattr(self.tk, 'createfilehandler'):
+            self._wakeup_r, wakeup_w = os.pipe()
+            os.set_blocking(wakeup_w, False)
+            self.response_queue.wakeup_fd = wakeup_w
+            self.tk.createfilehandler(self._wakeup_r, tk.READABLE, self._on_wakeup)
         self.main_container = ttk.Frame(self)
         self.main_container.pack(fill=tk.BOTH, expand=True)
         self.connection_frame = ttk.Frame(self.main_container, padding="20", style='Card.TFrame')
-        self.style.configure('Card.TFrame', background='#ffffff', borderwidth=1, relief='raised')
         self.main_view_frame = ttk.Frame(self.main_container, padding="10")
         self.connection_frame.pack(expand=True)
         self.connection_frame.columnconfigure(0, weight=1)
@@ -136,37 +389,70 @@ class RegistrarApp(tk.Tk):
         self.connection_frame.columnconfigure(3, weight=1)
         self.connection_frame.rowconfigure(0, weight=1)
         self.connection_frame.rowconfigure(5, weight=1)
-        ttk.Label(self.connection_frame, text="Server Port:", font=('Helvetica', 11)).grid(row=1, column=1, padx=5, pady=8, sticky=tk.E)
-        self.port_entry = ttk.Entry(self.connection_frame, width=15, font=('Helvetica', 10))
+        ttk.Label(self.connection_frame, text="Server Port:", font=self.label_font).grid(row=1, column=1, padx=5, pady=8, sticky=tk.E)
+        self.port_entry = ttk.Entry(self.connection_frame, width=15, font=self.entry_font)
         self.port_entry.grid(row=1, column=2, padx=5, pady=8, sticky=tk.W)
         self.port_entry.insert(0, "65432")
-        ttk.Label(self.connection_frame, text="Username:", font=('Helvetica', 11)).grid(row=2, column=1, padx=5, pady=8, sticky=tk.E)
-        self.username_entry = ttk.Entry(self.connection_frame, width=25, font=('Helvetica', 10))
+        ttk.Label(self.connection_frame, text="Username:", font=self.label_font).grid(row=2, column=1, padx=5, pady=8, sticky=tk.E)
+        self.username_entry = ttk.Entry(self.connection_frame, width=25, font=self.entry_font)
         self.username_entry.grid(row=2, column=2, padx=5, pady=8, sticky=tk.W)
-        ttk.Label(self.connection_frame, text="Password:", font=('Helvetica', 11)).grid(row=3, column=1, padx=5, pady=8, sticky=tk.E)
-        self.password_entry = ttk.Entry(self.connection_frame, width=25, show="*", font=('Helvetica', 10))
+        ttk.Label(self.connection_frame, text="Password:", font=self.label_font).grid(row=3, column=1, padx=5, pady=8, sticky=tk.E)
+        self.password_entry = ttk.Entry(self.connection_frame, width=25, show="*", font=self.entry_font)
         self.password_entry.grid(row=3, column=2, padx=5, pady=8, sticky=tk.W)
-        self.style.configure('Connect.TButton', font=('Helvetica', 11, 'bold'), padding=6)
         self.connect_button = ttk.Button(self.connection_frame, text="Connect & Login", command=self.connect_and_login, style='Connect.TButton', width=20)
         self.connect_button.grid(row=4, column=1, columnspan=2, pady=20)
         self.status_var = tk.StringVar()
         self.status_bar = ttk.Label(self, textvariable=self.status_var, relief=tk.SUNKEN, anchor=tk.W, padding="2 5", background='#f0f0f0')
         self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+        self._last_status = None
+        self._pending_status = None
+        self._status_scheduled = False
         self.set_status("Enter server port and credentials to connect.")
         self.course_tree = None
         self.my_course_tree = None
         self.action_frame = None
-        self.after(100, self.process_queue)
+        if self._wakeup_r is None:
+            self.after(100, self.process_queue)
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
 
+    def _configure_styles(self):
+        self.label_font = tkfont.Font(self, family='Helvetica', size=11)
+        self.entry_font = tkfont.Font(self, family='Helvetica', size=10)
+        self.button_font = tkfont.Font(self, family='Helvetica', size=11, weight='bold')
+        self.style.configure('Card.TFrame', background='#ffffff', borderwidth=1, relief='raised')
+        self.style.configure('Connect.TButton', font=self.button_font, padding=6)
+        self.style.configure('Dialog.TButton', font=self.entry_font, padding=5)
+
     def set_status(self, message, is_error=False):
+        self._pending_status = (message, is_error)
+        if not self._status_scheduled:
+            self._status_scheduled = True
+            self.after(16, self._flush_status)
+
+    def _flush_status(self):
+        self._status_scheduled = False
+        status = self._pending_status
+        if status == self._last_status:
+            return
+        self._last_status = status
+        message, is_error = status
         self.status_var.set(message)
         self.status_bar.config(foreground="red" if is_error else "black")
 
+    def _on_wakeup(self, fd, mask):
+        os.read(fd, 4096)
+        self.process_queue()
+
     def process_queue(self):
+        msgs = []
+        reset_view = False
         try:
             while True:
-                msg = self.response_queue.get_nowait()
+                msgs.append(self.response_queue.get_nowait())
+        except queue.Empty:
+            pass
+        try:
+            for msg in msgs:
                 msg_type = msg.get("type")
                 status = msg.get("status")
                 message = msg.get("message")
@@ -179,23 +465,26 @@ class RegistrarApp(tk.Tk):
                     elif status == "error":
                         messagebox.showerror("Connection Error", message)
                         self.set_status(f"Connection failed: {message}", is_error=True)
-                        self.reset_to_connection_view()
+                        reset_view = True
                     elif status == "disconnected":
                         self.set_status(message)
-                        self.reset_to_connection_view()
+                        reset_view = True
                 elif msg_type == "error":
                     messagebox.showerror("Error", message)
                     self.set_status(message, is_error=True)
                     if "Not connected" in message or "Communication error" in message:
-                        self.reset_to_connection_view()
+                        reset_view = True
                 elif msg_type == "server_response":
                     action = msg.get("action")
                     response = msg.get("response")
                     self.handle_server_response(action, response)
-        except queue.Empty:
-            pass
         finally:
-            self.after(100, self.process_queue)
+            if reset_view:
+                self.reset_to_connection_view()
+            if msgs:
+                self.update_idletasks()
+            if self._wakeup_r is None:
+                self.after(100, self.process_queue)
 
     def connect_and_login(self):
         port_str = self.port_entry.get()
@@ -211,21 +500,25 @@ class RegistrarApp(tk.Tk):
         if not username or not password:
             messagebox.showerror("Input Error", "Username and password are required.")
             return
+        login_type = self.ask_login_type()
+        if not login_type:
+            self.set_status("Login cancelled.")
+            return
+        client = self.network_client
+        if client and client.host == SERVER_HOST and client.port == port and client.is_alive():
+            self.attempt_login(login_type)
+            return
         if self.network_client:
             print("Disconnecting existing client before new attempt...")
             self.network_client.disconnect()
             self.network_client = None
         self.set_status(f"Connecting to {SERVER_HOST}:{port}...")
         self.network_client = NetworkClient(SERVER_HOST, port, self.response_queue)
-        login_type = self.ask_login_type()
-        if not login_type:
-            self.network_client = None
-            self.set_status("Login cancelled.")
-            return
         self._pending_login_type = login_type
-        threading.Thread(target=self.network_client.connect, daemon=True).start()
+        self.network_client.start()
 
     def ask_login_type(self):
+        from tkinter import Toplevel
         dialog = Toplevel(self)
         dialog.title("Login As")
         dialog.geometry("300x130")
@@ -236,14 +529,13 @@ class RegistrarApp(tk.Tk):
         x = self.winfo_rootx() + (self.winfo_width() // 2) - (300 // 2)
         y = self.winfo_rooty() + (self.winfo_height() // 2) - (130 // 2)
         dialog.geometry(f'+{x}+{y}')
-        ttk.Label(dialog, text="Please select your login role:", font=('Helvetica', 11), background='#f0f0f0').pack(pady=15)
+        ttk.Label(dialog, text="Please select your login role:", font=self.label_font, background='#f0f0f0').pack(pady=15)
         result = tk.StringVar()
         def set_choice(choice):
             result.set(choice)
             dialog.destroy()
         btn_frame = ttk.Frame(dialog, style='TFrame')
         btn_frame.pack(pady=10)
-        self.style.configure('Dialog.TButton', font=('Helvetica', 10), padding=5)
         ttk.Button(btn_frame, text="Student", command=lambda: set_choice('student'), width=10, style='Dialog.TButton').pack(side=tk.LEFT, padx=15)
         ttk.Button(btn_frame, text="Admin", command=lambda: set_choice('admin'), width=10, style='Dialog.TButton').pack(side=tk.RIGHT, padx=15)
         dialog.protocol("WM_DELETE_WINDOW", lambda: set_choice(""))
@@ -1,25 +1,162 @@
+import asyncio
 import socket
 import threading
+import queue
 import json
 import sqlite3
 import hashlib
+import hmac
+import functools
 import sys
+import os
+import urllib.parse
 import logging
-from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+    _loads = json.loads
 
 DATABASE_FILE = 'registrar.db'
 HOST = '127.0.0.1'
 ADMIN_USERNAME = "admin"
-ADMIN_PASSWORD = "admin_password"
+ADMIN_PASSWORD_HASH = "6d4525c2a21f9be1cca9e41f3aa402e0765ee5fcc3e7fea34a169b1730ae386e"
 MAX_COURSES_PER_STUDENT = 5
+DAY_BITS = {day: 1 << index for index, day in enumerate("MTWRFSU")}
+MAX_MESSAGE_SIZE = 1024 * 1024
+DB_WORKERS = 8
+WRITE_BATCH_SIZE = 32
+WRITE_TIMEOUT = 60
+LISTEN_BACKLOG = 128
 LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
 logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
 
-db_lock = threading.Lock()
+CONNECTION_PRAGMAS = (
+    "PRAGMA busy_timeout=30000",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA foreign_keys=ON",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY",
+)
+DATABASE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA wal_autocheckpoint=1000",
+)
+STATEMENT_CACHE_SIZE = 256
+
+SQL_ADMIN_EXISTS = "SELECT username FROM admins WHERE username = ?"
+SQL_INSERT_ADMIN = "INSERT INTO admins (username, password_hash) VALUES (?, ?)"
+SQL_STUDENT_PASSWORD = "SELECT password_hash FROM students WHERE username = ?"
+SQL_ADMIN_PASSWORD = "SELECT password_hash FROM admins WHERE username = ?"
+SQL_ALL_COURSES = """
+    SELECT c.name, c.schedule, c.capacity,
+           (c.capacity - COUNT(r.course_name)) as remaining_seats
+    FROM courses c
+    LEFT JOIN registrations r ON c.name = r.course_name
+    GROUP BY c.name, c.schedule, c.capacity
+    ORDER BY c.name
+"""
+SQL_STUDENT_COURSES = """
+    SELECT c.name, c.schedule, c.capacity
+    FROM courses c
+    JOIN registrations r ON c.name = r.course_name
+    WHERE r.student_username = ?
+    ORDER BY c.name
+"""
+SQL_STUDENT_SCHEDULES = """
+    SELECT c.name, c.schedule
+    FROM courses c
+    JOIN registrations r ON c.name = r.course_name
+    WHERE r.student_username = ?
+    ORDER BY c.name
+"""
+SQL_REGISTRATION_CHECK = """
+    SELECT c.name, c.schedule,
+           c.capacity - (SELECT COUNT(*) FROM registrations WHERE course_name = c.name) AS remaining_seats,
+           EXISTS(SELECT 1 FROM registrations WHERE course_name = c.name AND student_username = ?) AS already_registered,
+           (SELECT COUNT(*) FROM registrations WHERE student_username = ?) AS registered_count
+    FROM courses c
+    WHERE c.name = ?
+"""
+SQL_REGISTER = """
+    INSERT INTO registrations (student_username, course_name)
+    SELECT ?1, c.name
+    FROM courses c
+    WHERE c.name = ?2
+      AND (SELECT COUNT(*) FROM registrations WHERE course_name = c.name) < c.capacity
+      AND (SELECT COUNT(*) FROM registrations WHERE student_username = ?1) < ?3
+      AND NOT EXISTS(SELECT 1 FROM registrations WHERE student_username = ?1 AND course_name = c.name)
+      AND NOT EXISTS(
+          SELECT 1
+          FROM registrations r
+          JOIN courses o ON o.name = r.course_name
+          WHERE r.student_username = ?1 AND schedules_overlap(o.schedule, c.schedule)
+      )
+"""
+SQL_DELETE_REGISTRATION = "DELETE FROM registrations WHERE student_username = ? AND course_name = ?"
+SQL_COURSE_EXISTS = "SELECT 1 FROM courses WHERE name = ?"
+SQL_INSERT_COURSE = "INSERT INTO courses (name, schedule, capacity) VALUES (?, ?, ?)"
+SQL_COURSE_CAPACITY = "SELECT capacity FROM courses WHERE name = ?"
+SQL_UPDATE_CAPACITY = "UPDATE courses SET capacity = ? WHERE name = ?"
+SQL_STUDENT_EXISTS = "SELECT 1 FROM students WHERE username = ?"
+SQL_INSERT_STUDENT = "INSERT INTO students (name, username, password_hash) VALUES (?, ?, ?)"
+READER_STATEMENTS = (SQL_STUDENT_PASSWORD, SQL_ADMIN_PASSWORD, SQL_ALL_COURSES, SQL_STUDENT_COURSES)
+WRITER_STATEMENTS = (
+    SQL_REGISTRATION_CHECK, SQL_STUDENT_SCHEDULES, SQL_COURSE_EXISTS, SQL_COURSE_CAPACITY,
+    SQL_STUDENT_EXISTS, SQL_DELETE_REGISTRATION, SQL_UPDATE_CAPACITY,
+)
+
+data_version = 0
+_writer_conn = None
+_tls = threading.local()
+_db_pool = None
+_write_queue = queue.Queue()
+_courses_cache = None
+_courses_cache_lock = threading.Lock()
+_password_hashes = {'student': {}, 'admin': {}}
+_password_hashes_lock = threading.Lock()
+
+def connect_db(read_only=False, **kwargs):
+    if read_only:
+        database = f"file:{urllib.parse.quote(os.path.abspath(DATABASE_FILE))}?mode=ro"
+        kwargs['uri'] = True
+    else:
+        database = DATABASE_FILE
+    conn = sqlite3.connect(database, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE, **kwargs)
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+def warm_statements(conn, statements):
+    conn.execute("SAVEPOINT warm")
+    try:
+        for sql in statements:
+            conn.execute(sql, (None,) * sql.count('?'))
+    finally:
+        conn.execute("ROLLBACK TO warm")
+        conn.execute("RELEASE warm")
+
+def reader_connection():
+    conn = getattr(_tls, 'conn', None)
+    if conn is None:
+        conn = connect_db(read_only=True, isolation_level=None)
+        warm_statements(conn, READER_STATEMENTS)
+        _tls.conn = conn
+    return conn
 
 def init_db():
+    global _writer_conn
+    conn = None
     try:
-        conn = sqlite3.connect(DATABASE_FILE, check_same_thread=False)
+        conn = connect_db()
+        for pragma in DATABASE_PRAGMAS:
+            conn.execute(pragma)
+        conn.create_function("schedules_overlap", 2, check_schedule_overlap, deterministic=True)
         cursor = conn.cursor()
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS admins (
@@ -50,26 +187,39 @@ def init_db():
                 PRIMARY KEY (student_username, course_name)
             )
         ''')
-        cursor.execute("SELECT username FROM admins WHERE username = ?", (ADMIN_USERNAME,))
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_reg_course ON registrations(course_name)")
+        cursor.execute(SQL_ADMIN_EXISTS, (ADMIN_USERNAME,))
         if cursor.fetchone() is None:
-            hashed_password = hashlib.sha256(ADMIN_PASSWORD.encode()).hexdigest()
-            cursor.execute("INSERT INTO admins (username, password_hash) VALUES (?, ?)", (ADMIN_USERNAME, hashed_password))
+            cursor.execute(SQL_INSERT_ADMIN, (ADMIN_USERNAME, ADMIN_PASSWORD_HASH))
             logging.info(f"Default admin user '{ADMIN_USERNAME}' created.")
         conn.commit()
+        warm_statements(conn, WRITER_STATEMENTS)
+        _writer_conn = conn
+        threading.Thread(target=writer_loop, name='db-writer', daemon=True).start()
         logging.info("Database initialized successfully.")
     except sqlite3.Error as e:
         logging.error(f"Database error during initialization: {e}")
-        sys.exit(1)
-    finally:
         if conn:
             conn.close()
+        sys.exit(1)
 
 def hash_password(password):
     return hashlib.sha256(password.encode()).hexdigest()
 
 def verify_password(stored_hash, provided_password):
-    return stored_hash == hash_password(provided_password)
+    return hmac.compare_digest(stored_hash, hash_password(provided_password))
+
+def parse_clock(time_str):
+    hours, sep, minutes = time_str.partition(':')
+    if not sep or not 1 <= len(hours) <= 2 or len(minutes) != 2 or not (hours.isdecimal() and minutes.isdecimal()):
+        raise ValueError(f"Invalid time: {time_str}")
+    hours = int(hours)
+    minutes = int(minutes)
+    if hours > 23 or minutes > 59:
+        raise ValueError(f"Invalid time: {time_str}")
+    return hours * 60 + minutes
 
+@functools.lru_cache(maxsize=1024)
 def parse_schedule(schedule_str):
     try:
         parts = schedule_str.split()
@@ -77,22 +227,18 @@ def parse_schedule(schedule_str):
             return None
         days_str = parts[0].upper()
         time_str = parts[1]
-        days = set()
-        valid_days = "MTWRFSU"
-        for char in days_str:
-            if char not in valid_days:
-                return None
-            days.add(char)
+        days = frozenset(days_str)
+        if not days.issubset(DAY_BITS):
+            return None
+        day_mask = sum(map(DAY_BITS.__getitem__, days))
         time_parts = time_str.split('-')
         if len(time_parts) != 2:
             return None
-        start_time = datetime.strptime(time_parts[0], '%H:%M')
-        end_time = datetime.strptime(time_parts[1], '%H:%M')
-        start_minutes = start_time.hour * 60 + start_time.minute
-        end_minutes = end_time.hour * 60 + end_time.minute
+        start_minutes = parse_clock(time_parts[0])
+        end_minutes = parse_clock(time_parts[1])
         if start_minutes >= end_minutes:
             return None
-        return days, start_minutes, end_minutes
+        return day_mask, start_minutes, end_minutes
     except ValueError:
         logging.warning(f"Invalid schedule format: {schedule_str}")
         return None
@@ -104,51 +250,132 @@ def check_schedule_overlap(schedule1_str, schedule2_str):
         return False
     days1, start1, end1 = parsed1
     days2, start2, end2 = parsed2
-    if not days1.intersection(days2):
+    if not days1 & days2:
         return False
     if max(start1, start2) < min(end1, end2):
         return True
     return False
 
-def db_execute(query, params=(), fetchone=False, fetchall=False, commit=False):
-    conn = None
+def check_schedule_overlap_batch(new_schedule, parsed_schedules):
+    new_mask, new_start, new_end = new_schedule
+    return next(((name, schedule) for mask, start, end, name, schedule in parsed_schedules
+                 if mask & new_mask and max(start, new_start) < min(end, new_end)), None)
+
+def db_execute(query, params=(), fetchone=False, fetchall=False):
     result = None
-    acquired_lock = False
     try:
-        if commit:
-            db_lock.acquire()
-            acquired_lock = True
-        conn = sqlite3.connect(DATABASE_FILE, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        if commit:
-            conn.commit()
-            result = True
-        elif fetchone:
+        cursor = reader_connection().execute(query, params)
+        if fetchone:
             result = cursor.fetchone()
         elif fetchall:
             result = cursor.fetchall()
     except sqlite3.Error as e:
         logging.error(f"Database error: {e} | Query: {query} | Params: {params}")
-        if commit and conn:
-            conn.rollback()
-        result = False if commit else None
-    finally:
-        if conn:
-            conn.close()
-        if acquired_lock:
-            db_lock.release()
     return result
 
+def db_transaction(work):
+    future = Future()
+    _write_queue.put((work, future))
+    try:
+        return future.result(timeout=WRITE_TIMEOUT)
+    except FutureTimeoutError:
+        if not future.cancel():
+            return future.result()
+        logging.error(f"Timed out after {WRITE_TIMEOUT}s waiting for the writer to run {work.__name__}")
+        return None
+
+def run_write_batch(batch):
+    global data_version
+    changes_before = _writer_conn.total_changes
+    outcomes = []
+    try:
+        _writer_conn.execute("BEGIN IMMEDIATE")
+        cursor = _writer_conn.cursor()
+        for work, _ in batch:
+            cursor.execute("SAVEPOINT work")
+            try:
+                outcomes.append((work(cursor), None))
+            except Exception as e:
+                if isinstance(e, sqlite3.Error):
+                    logging.error(f"Database error in {work.__name__}: {e}")
+                    e = None
+                cursor.execute("ROLLBACK TO work")
+                outcomes.append((None, e))
+            cursor.execute("RELEASE work")
+        _writer_conn.commit()
+    except sqlite3.Error as e:
+        logging.error(f"Database error committing {len(batch)} writes: {e}")
+        try:
+            _writer_conn.rollback()
+        except sqlite3.Error as rollback_error:
+            logging.error(f"Database error rolling back {len(batch)} writes: {rollback_error}")
+        outcomes = [(None, None)] * len(batch)
+    if _writer_conn.total_changes != changes_before:
+        data_version += 1
+    return outcomes
+
+def writer_loop():
+    while True:
+        batch = [_write_queue.get()]
+        while len(batch) < WRITE_BATCH_SIZE:
+            try:
+                batch.append(_write_queue.get_nowait())
+            except queue.Empty:
+                break
+        batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+        if not batch:
+            continue
+        try:
+            outcomes = run_write_batch(batch)
+            for (_, future), (result, error) in zip(batch, outcomes):
+                if error is None:
+                    future.set_result(result)
+                else:
+                    future.set_exception(error)
+        except Exception as e:
+            logging.error(f"Writer failed on a batch of {len(batch)} writes: {e}", exc_info=True)
+            try:
+                if _writer_conn.in_transaction:
+                    _writer_conn.rollback()
+            except sqlite3.Error as rollback_error:
+                logging.error(f"Database error rolling back {len(batch)} writes: {rollback_error}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+def lookup_password_hash(user_type, username, conn):
+    hashes = _password_hashes[user_type]
+    stored_hash = hashes.get(username)
+    if stored_hash is None:
+        row = conn.execute(SQL_STUDENT_PASSWORD if user_type == 'student' else SQL_ADMIN_PASSWORD, (username,)).fetchone()
+        if row is None:
+            return None
+        stored_hash = row[0]
+        remember_password_hash(user_type, username, stored_hash)
+    return stored_hash
+
+def remember_password_hash(user_type, username, password_hash):
+    with _password_hashes_lock:
+        _password_hashes[user_type][username] = password_hash
+
+def login_student_bundle(username, password):
+    conn = reader_connection()
+    try:
+        stored_hash = lookup_password_hash('student', username, conn)
+        if not stored_hash or not verify_password(stored_hash, password):
+            return None
+        return registered_course_dicts(conn.execute(SQL_STUDENT_COURSES, (username,)))
+    except sqlite3.Error as e:
+        logging.error(f"Database error during login for '{username}': {e}")
+        return None
+
 def handle_login_student(data):
     username = data.get('username')
     password = data.get('password')
     if not username or not password:
         return {"status": "error", "message": "Username and password required"}
-    student = db_execute("SELECT password_hash FROM students WHERE username = ?", (username,), fetchone=True)
-    if student and verify_password(student['password_hash'], password):
-        registered_courses = get_student_registered_courses(username)
+    registered_courses = login_student_bundle(username, password)
+    if registered_courses is not None:
         return {"status": "success", "data": {"registered_courses": registered_courses}}
     else:
         return {"status": "error", "message": "Invalid credentials"}
@@ -158,92 +385,160 @@ def handle_login_admin(data):
     password = data.get('password')
     if not username or not password:
         return {"status": "error", "message": "Username and password required"}
-    admin = db_execute("SELECT password_hash FROM admins WHERE username = ?", (username,), fetchone=True)
-    if admin and verify_password(admin['password_hash'], password):
+    try:
+        stored_hash = lookup_password_hash('admin', username, reader_connection())
+    except sqlite3.Error as e:
+        logging.error(f"Database error during login for '{username}': {e}")
+        stored_hash = None
+    if stored_hash and verify_password(stored_hash, password):
         all_courses = get_all_courses_details()
         return {"status": "success", "data": {"courses": all_courses}}
     else:
         return {"status": "error", "message": "Invalid credentials"}
 
 def get_all_courses_details():
-    courses = db_execute("""
-        SELECT c.name, c.schedule, c.capacity,
-               (c.capacity - COUNT(r.course_name)) as remaining_seats
-        FROM courses c
-        LEFT JOIN registrations r ON c.name = r.course_name
-        GROUP BY c.name, c.schedule, c.capacity
-        ORDER BY c.name
-    """, fetchall=True)
-    return [dict(row) for row in courses] if courses else []
+    global _courses_cache
+    version = data_version
+    cached = _courses_cache
+    if cached and cached[0] == version:
+        return cached[1]
+    rows = db_execute(SQL_ALL_COURSES, fetchall=True)
+    courses = [
+        {"name": name, "schedule": schedule, "capacity": capacity, "remaining_seats": remaining_seats}
+        for name, schedule, capacity, remaining_seats in rows
+    ] if rows else []
+    if rows is not None:
+        with _courses_cache_lock:
+            if not _courses_cache or _courses_cache[0] <= version:
+                _courses_cache = [version, courses, None]
+    return courses
+
+def registered_course_dicts(rows):
+    return [{"name": name, "schedule": schedule, "capacity": capacity} for name, schedule, capacity in rows]
 
 def get_student_registered_courses(student_username):
-    courses = db_execute("""
-        SELECT c.name, c.schedule, c.capacity
-        FROM courses c
-        JOIN registrations r ON c.name = r.course_name
-        WHERE r.student_username = ?
-        ORDER BY c.name
-    """, (student_username,), fetchall=True)
-    return [dict(row) for row in courses] if courses else []
+    courses = db_execute(SQL_STUDENT_COURSES, (student_username,), fetchall=True)
+    return registered_course_dicts(courses) if courses else []
+
+def get_student_parsed_schedules(cursor, student_username):
+    rows = cursor.execute(SQL_STUDENT_SCHEDULES, (student_username,)).fetchall()
+    parsed = []
+    for name, schedule_str in rows:
+        schedule = parse_schedule(schedule_str)
+        if schedule:
+            parsed.append((*schedule, name, schedule_str))
+    return parsed
+
+def versioned_response(data, key, fetch):
+    version = data_version
+    if data.get('since') == version:
+        return {"status": "success", "data": {"unchanged": True, "version": version}}
+    return {"status": "success", "data": {key: fetch(), "version": version}}
+
+class PrebuiltResponse(bytes):
+    def with_id(self, request_id):
+        return self[:-1] + b',"id":' + _dumps(request_id) + b'}'
+
+    def for_request(self, request):
+        if isinstance(request, dict) and 'id' in request:
+            return self.with_id(request['id'])
+        return self
+
+def prebuilt_response(status, message):
+    return PrebuiltResponse(_dumps({"status": status, "message": message}))
+
+RESPONSE_INVALID_JSON = prebuilt_response("error", "Invalid JSON format")
+RESPONSE_INVALID_REQUEST = prebuilt_response("error", "Invalid request format")
+RESPONSE_INTERNAL_ERROR = prebuilt_response("error", "An internal server error occurred")
+RESPONSE_AUTH_REQUIRED = prebuilt_response("error", "Authentication required")
+RESPONSE_LOGGED_OUT = prebuilt_response("success", "Logged out")
+RESPONSE_INVALID_ACTION = {
+    user_type: prebuilt_response("error", f"Invalid action for {user_type}")
+    for user_type in ('student', 'admin')
+}
+
+def courses_response(data):
+    cached = _courses_cache
+    if cached and cached[0] == data_version and data.get('since') != cached[0]:
+        if cached[2] is None:
+            cached[2] = PrebuiltResponse(_dumps({"status": "success", "data": {"courses": cached[1], "version": cached[0]}}))
+        return cached[2]
+    return versioned_response(data, "courses", get_all_courses_details)
 
 def handle_list_courses_student(data, student_username):
-    courses = get_all_courses_details()
-    return {"status": "success", "data": {"courses": courses}}
+    return courses_response(data)
 
 def handle_list_courses_admin(data, admin_username):
-    courses = get_all_courses_details()
-    return {"status": "success", "data": {"courses": courses}}
+    return courses_response(data)
 
 def handle_my_courses(data, student_username):
+    return versioned_response(data, "registered_courses", lambda: get_student_registered_courses(student_username))
+
+def registration_failure(cursor, student_username, course_name):
+    course = cursor.execute(SQL_REGISTRATION_CHECK, (student_username, student_username, course_name)).fetchone()
+    if not course:
+        return f"Course '{course_name}' not found"
+    _, schedule, remaining_seats, already_registered, registered_count = course
+    if remaining_seats <= 0:
+        return f"Course '{course_name}' is full"
+    if already_registered:
+        return f"You are already registered for '{course_name}'"
+    if registered_count >= MAX_COURSES_PER_STUDENT:
+        return f"Cannot register for more than {MAX_COURSES_PER_STUDENT} courses"
+    new_schedule = parse_schedule(schedule)
+    if new_schedule and registered_count:
+        conflict = check_schedule_overlap_batch(new_schedule, get_student_parsed_schedules(cursor, student_username))
+        if conflict:
+            return f"Schedule conflict with '{conflict[0]}' ({conflict[1]})"
+    return f"Could not register for '{course_name}'"
+
+def register_student(student_username, course_name):
+    def register(cursor):
+        cursor.execute(SQL_REGISTER, (student_username, course_name, MAX_COURSES_PER_STUDENT))
+        if not cursor.rowcount:
+            return False, registration_failure(cursor, student_username, course_name)
+        return True, f"Successfully registered for '{course_name}'"
+
+    result = db_transaction(register)
+    if result is None:
+        return False, "Failed to register for course due to a database error"
+    if result[0]:
+        logging.info(f"Student '{student_username}' registered for course '{course_name}'")
+    return result
+
+def withdraw_student(student_username, course_name):
+    def withdraw(cursor):
+        cursor.execute(SQL_DELETE_REGISTRATION, (student_username, course_name))
+        if not cursor.rowcount:
+            return False, f"You are not registered for '{course_name}'"
+        return True, f"Successfully withdrew from '{course_name}'"
+
+    result = db_transaction(withdraw)
+    if result is None:
+        return False, "Failed to withdraw from course due to a database error"
+    if result[0]:
+        logging.info(f"Student '{student_username}' withdrew from course '{course_name}'")
+    return result
+
+def registration_response(student_username, success, message):
+    if not success:
+        return {"status": "error", "message": message}
     registered_courses = get_student_registered_courses(student_username)
-    return {"status": "success", "data": {"registered_courses": registered_courses}}
+    return {"status": "success", "message": message, "data": {"registered_courses": registered_courses, "courses": get_all_courses_details()}}
 
 def handle_register_course(data, student_username):
     course_name = data.get('course_name')
     if not course_name:
         return {"status": "error", "message": "Course name required"}
-    course = db_execute("""
-        SELECT c.name, c.schedule, c.capacity,
-               (c.capacity - COUNT(r.course_name)) as remaining_seats
-        FROM courses c
-        LEFT JOIN registrations r ON c.name = r.course_name
-        WHERE c.name = ?
-        GROUP BY c.name
-    """, (course_name,), fetchone=True)
-    if not course:
-        return {"status": "error", "message": f"Course '{course_name}' not found"}
-    if course['remaining_seats'] <= 0:
-        return {"status": "error", "message": f"Course '{course_name}' is full"}
-    existing_reg = db_execute("SELECT 1 FROM registrations WHERE student_username = ? AND course_name = ?", (student_username, course_name), fetchone=True)
-    if existing_reg:
-        return {"status": "error", "message": f"You are already registered for '{course_name}'"}
-    registered_courses = get_student_registered_courses(student_username)
-    if len(registered_courses) >= MAX_COURSES_PER_STUDENT:
-        return {"status": "error", "message": f"Cannot register for more than {MAX_COURSES_PER_STUDENT} courses"}
-    new_course_schedule = course['schedule']
-    for reg_course in registered_courses:
-        if check_schedule_overlap(new_course_schedule, reg_course['schedule']):
-            return {"status": "error", "message": f"Schedule conflict with '{reg_course['name']}' ({reg_course['schedule']})"}
-    success = db_execute("INSERT INTO registrations (student_username, course_name) VALUES (?, ?)", (student_username, course_name), commit=True)
-    if success:
-        logging.info(f"Student '{student_username}' registered for course '{course_name}'")
-        return {"status": "success", "message": f"Successfully registered for '{course_name}'"}
-    else:
-        return {"status": "error", "message": "Failed to register for course due to a database error"}
+    success, message = register_student(student_username, course_name)
+    return registration_response(student_username, success, message)
 
 def handle_withdraw_course(data, student_username):
     course_name = data.get('course_name')
     if not course_name:
         return {"status": "error", "message": "Course name required"}
-    existing_reg = db_execute("SELECT 1 FROM registrations WHERE student_username = ? AND course_name = ?", (student_username, course_name), fetchone=True)
-    if not existing_reg:
-        return {"status": "error", "message": f"You are not registered for '{course_name}'"}
-    success = db_execute("DELETE FROM registrations WHERE student_username = ? AND course_name = ?", (student_username, course_name), commit=True)
-    if success:
-        logging.info(f"Student '{student_username}' withdrew from course '{course_name}'")
-        return {"status": "success", "message": f"Successfully withdrew from '{course_name}'"}
-    else:
-        return {"status": "error", "message": "Failed to withdraw from course due to a database error"}
+    success, message = withdraw_student(student_username, course_name)
+    return registration_response(student_username, success, message)
 
 def handle_create_course(data, admin_username):
     name = data.get('name')
@@ -259,15 +554,21 @@ def handle_create_course(data, admin_username):
         return {"status": "error", "message": "Invalid capacity value"}
     if not parse_schedule(schedule):
         return {"status": "error", "message": "Invalid schedule format. Use Days HH:MM-HH:MM (e.g., MWF 10:00-11:00)"}
-    existing = db_execute("SELECT 1 FROM courses WHERE name = ?", (name,), fetchone=True)
-    if existing:
-        return {"status": "error", "message": f"Course '{name}' already exists"}
-    success = db_execute("INSERT INTO courses (name, schedule, capacity) VALUES (?, ?, ?)", (name, schedule, capacity), commit=True)
-    if success:
-        logging.info(f"Admin '{admin_username}' created course '{name}'")
-        return {"status": "success", "message": f"Course '{name}' created successfully"}
-    else:
+
+    def create(cursor):
+        if cursor.execute(SQL_COURSE_EXISTS, (name,)).fetchone():
+            return False, f"Course '{name}' already exists"
+        cursor.execute(SQL_INSERT_COURSE, (name, schedule, capacity))
+        return True, None
+
+    result = db_transaction(create)
+    if result is None:
         return {"status": "error", "message": "Failed to create course due to a database error"}
+    success, message = result
+    if not success:
+        return {"status": "error", "message": message}
+    logging.info(f"Admin '{admin_username}' created course '{name}'")
+    return {"status": "success", "message": f"Course '{name}' created successfully", "data": {"courses": get_all_courses_details()}}
 
 def handle_update_course(data, admin_username):
     name = data.get('name')
@@ -278,18 +579,25 @@ def handle_update_course(data, admin_username):
         new_capacity = int(new_capacity)
     except ValueError:
         return {"status": "error", "message": "Invalid capacity value"}
-    course = db_execute("SELECT capacity FROM courses WHERE name = ?", (name,), fetchone=True)
-    if not course:
-        return {"status": "error", "message": f"Course '{name}' not found"}
-    current_capacity = course['capacity']
-    if new_capacity <= current_capacity:
-        return {"status": "error", "message": f"New capacity ({new_capacity}) must be greater than current capacity ({current_capacity})"}
-    success = db_execute("UPDATE courses SET capacity = ? WHERE name = ?", (new_capacity, name), commit=True)
-    if success:
-        logging.info(f"Admin '{admin_username}' updated capacity for course '{name}' to {new_capacity}")
-        return {"status": "success", "message": f"Capacity for course '{name}' updated to {new_capacity}"}
-    else:
+
+    def update(cursor):
+        course = cursor.execute(SQL_COURSE_CAPACITY, (name,)).fetchone()
+        if not course:
+            return False, f"Course '{name}' not found"
+        current_capacity = course[0]
+        if new_capacity <= current_capacity:
+            return False, f"New capacity ({new_capacity}) must be greater than current capacity ({current_capacity})"
+        cursor.execute(SQL_UPDATE_CAPACITY, (new_capacity, name))
+        return True, None
+
+    result = db_transaction(update)
+    if result is None:
         return {"status": "error", "message": "Failed to update course capacity due to a database error"}
+    success, message = result
+    if not success:
+        return {"status": "error", "message": message}
+    logging.info(f"Admin '{admin_username}' updated capacity for course '{name}' to {new_capacity}")
+    return {"status": "success", "message": f"Capacity for course '{name}' updated to {new_capacity}", "data": {"courses": get_all_courses_details()}}
 
 def handle_add_student(data, admin_username):
     name = data.get('name')
@@ -297,89 +605,165 @@ def handle_add_student(data, admin_username):
     password = data.get('password')
     if not name or not username or not password:
         return {"status": "error", "message": "Student name, username, and password required"}
-    existing = db_execute("SELECT 1 FROM students WHERE username = ?", (username,), fetchone=True)
-    if existing:
-        return {"status": "error", "message": f"Student username '{username}' already exists"}
     hashed_password = hash_password(password)
-    success = db_execute("INSERT INTO students (name, username, password_hash) VALUES (?, ?, ?)", (name, username, hashed_password), commit=True)
-    if success:
-        logging.info(f"Admin '{admin_username}' added student '{username}'")
-        return {"status": "success", "message": f"Student '{username}' added successfully"}
-    else:
+
+    def add(cursor):
+        if cursor.execute(SQL_STUDENT_EXISTS, (username,)).fetchone():
+            return False, f"Student username '{username}' already exists"
+        cursor.execute(SQL_INSERT_STUDENT, (name, username, hashed_password))
+        return True, None
+
+    result = db_transaction(add)
+    if result is None:
         return {"status": "error", "message": "Failed to add student due to a database error"}
+    success, message = result
+    if not success:
+        return {"status": "error", "message": message}
+    remember_password_hash('student', username, hashed_password)
+    logging.info(f"Admin '{admin_username}' added student '{username}'")
+    return {"status": "success", "message": f"Student '{username}' added successfully"}
+
+def handle_add_students_bulk(data, admin_username):
+    students = data.get('students')
+    if not students or not isinstance(students, list):
+        return {"status": "error", "message": "Student list required"}
+    candidates = []
+    results = []
+    for student in students:
+        student = student if isinstance(student, dict) else {}
+        name, username, password = student.get('name'), student.get('username'), student.get('password')
+        if not name or not username or not password:
+            results.append({"username": username, "status": "error", "message": "Student name, username, and password required"})
+        else:
+            result = {"username": username}
+            candidates.append((result, (name, username, hash_password(password))))
+            results.append(result)
+
+    def add_all(cursor):
+        rows = []
+        seen = set()
+        for result, row in candidates:
+            username = row[1]
+            if username in seen or cursor.execute(SQL_STUDENT_EXISTS, (username,)).fetchone():
+                result.update(status="error", message=f"Student username '{username}' already exists")
+                continue
+            seen.add(username)
+            result.update(status="success", message=f"Student '{username}' added successfully")
+            rows.append(row)
+        cursor.executemany(SQL_INSERT_STUDENT, rows)
+        return rows
 
-def handle_client(conn, addr):
+    added = db_transaction(add_all) if candidates else []
+    if added is None:
+        return {"status": "error", "message": "Failed to add students due to a database error"}
+    for _, username, hashed_password in added:
+        remember_password_hash('student', username, hashed_password)
+    if added:
+        logging.info(f"Admin '{admin_username}' added {len(added)} students in bulk")
+    message = "; ".join(result['message'] for result in results)
+    return {"status": "success" if added else "error", "message": message, "data": {"results": results}}
+
+STUDENT_HANDLERS = {
+    'list_courses_student': handle_list_courses_student,
+    'register_course': handle_register_course,
+    'withdraw_course': handle_withdraw_course,
+    'my_courses': handle_my_courses,
+}
+ADMIN_HANDLERS = {
+    'list_courses_admin': handle_list_courses_admin,
+    'create_course': handle_create_course,
+    'update_course': handle_update_course,
+    'add_student': handle_add_student,
+    'add_students_bulk': handle_add_students_bulk,
+}
+HANDLERS = {'student': STUDENT_HANDLERS, 'admin': ADMIN_HANDLERS}
+
+async def recv_message(reader):
+    try:
+        header = await reader.readexactly(4)
+        length = int.from_bytes(header, 'big')
+        if length > MAX_MESSAGE_SIZE:
+            logging.warning(f"Rejecting {length} byte message (limit is {MAX_MESSAGE_SIZE} bytes)")
+            return None
+        return await reader.readexactly(length)
+    except asyncio.IncompleteReadError:
+        return None
+
+async def send_payload(writer, payload):
+    writer.writelines((len(payload).to_bytes(4, 'big'), payload))
+    await writer.drain()
+
+async def send_message(writer, message):
+    await send_payload(writer, _dumps(message))
+
+async def run_db(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(_db_pool, func, *args)
+
+async def handle_client(reader, writer):
+    addr = writer.get_extra_info('peername')
+    sock = writer.get_extra_info('socket')
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
     logging.info(f"Connection established with {addr}")
     is_authenticated = False
     user_type = None
     username = None
     try:
         while True:
-            data = conn.recv(4096)
-            if not data:
+            data = await recv_message(reader)
+            if data is None:
                 logging.info(f"Client {addr} disconnected (no data received).")
                 break
             try:
-                request = json.loads(data.decode('utf-8'))
+                request = _loads(data)
+            except ValueError:
+                await send_payload(writer, RESPONSE_INVALID_JSON)
+                continue
+            try:
+                req_data = (request.get('data') or {}) if isinstance(request, dict) else None
+                if not isinstance(req_data, dict):
+                    await send_payload(writer, RESPONSE_INVALID_REQUEST.for_request(request))
+                    continue
                 action = request.get('action')
-                req_data = request.get('data', {})
-                response = {"status": "error", "message": "Invalid action"}
                 if not is_authenticated:
                     if action == 'login_student':
-                        response = handle_login_student(req_data)
+                        response = await run_db(handle_login_student, req_data)
                         if response['status'] == 'success':
                             is_authenticated = True
                             user_type = 'student'
                             username = req_data['username']
                             logging.info(f"Student '{username}' authenticated from {addr}")
                     elif action == 'login_admin':
-                        response = handle_login_admin(req_data)
+                        response = await run_db(handle_login_admin, req_data)
                         if response['status'] == 'success':
                             is_authenticated = True
                             user_type = 'admin'
                             username = req_data['username']
                             logging.info(f"Admin '{username}' authenticated from {addr}")
                     else:
-                        response = {"status": "error", "message": "Authentication required"}
+                        response = RESPONSE_AUTH_REQUIRED
+                elif action == 'logout':
+                    response = RESPONSE_LOGGED_OUT
+                    is_authenticated = False
                 else:
-                    if user_type == 'student':
-                        if action == 'list_courses_student':
-                            response = handle_list_courses_student(req_data, username)
-                        elif action == 'register_course':
-                            response = handle_register_course(req_data, username)
-                        elif action == 'withdraw_course':
-                            response = handle_withdraw_course(req_data, username)
-                        elif action == 'my_courses':
-                            response = handle_my_courses(req_data, username)
-                        elif action == 'logout':
-                            response = {"status": "success", "message": "Logged out"}
-                            is_authenticated = False
-                        else:
-                            response = {"status": "error", "message": "Invalid action for student"}
-                    elif user_type == 'admin':
-                        if action == 'list_courses_admin':
-                            response = handle_list_courses_admin(req_data, username)
-                        elif action == 'create_course':
-                            response = handle_create_course(req_data, username)
-                        elif action == 'update_course':
-                            response = handle_update_course(req_data, username)
-                        elif action == 'add_student':
-                            response = handle_add_student(req_data, username)
-                        elif action == 'logout':
-                            response = {"status": "success", "message": "Logged out"}
-                            is_authenticated = False
-                        else:
-                            response = {"status": "error", "message": "Invalid action for admin"}
-                conn.sendall(json.dumps(response).encode('utf-8'))
-                if action == 'logout' and response['status'] == 'success':
+                    handler = HANDLERS[user_type].get(action)
+                    if handler:
+                        response = await run_db(handler, req_data, username)
+                    else:
+                        response = RESPONSE_INVALID_ACTION[user_type]
+                if isinstance(response, PrebuiltResponse):
+                    await send_payload(writer, response.for_request(request))
+                else:
+                    if 'id' in request:
+                        response = {**response, "id": request['id']}
+                    await send_message(writer, response)
+                if response is RESPONSE_LOGGED_OUT:
                     logging.info(f"User '{username}' ({user_type}) logged out from {addr}")
                     break
-            except json.JSONDecodeError:
-                conn.sendall(json.dumps({"status": "error", "message": "Invalid JSON format"}).encode('utf-8'))
             except Exception as e:
                 logging.error(f"Error handling request from {addr}: {e}", exc_info=True)
                 try:
-                    conn.sendall(json.dumps({"status": "error", "message": "An internal server error occurred"}).encode('utf-8'))
+                    await send_payload(writer, RESPONSE_INTERNAL_ERROR.for_request(request))
                 except Exception as send_e:
                     logging.error(f"Failed to send error response to {addr}: {send_e}")
     except ConnectionResetError:
@@ -388,30 +772,34 @@ def handle_client(conn, addr):
         logging.error(f"An unexpected error occurred with client {addr}: {e}", exc_info=True)
     finally:
         logging.info(f"Closing connection with {addr}")
-        conn.close()
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
 
-def main(port):
-    init_db()
-    server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+async def serve(port):
+    global _db_pool
+    _db_pool = ThreadPoolExecutor(max_workers=DB_WORKERS, thread_name_prefix='db')
     try:
-        server_socket.bind((HOST, port))
-        server_socket.listen(5)
-        logging.info(f"Server listening on {HOST}:{port}")
-        while True:
-            try:
-                conn, addr = server_socket.accept()
-                client_thread = threading.Thread(target=handle_client, args=(conn, addr), daemon=True)
-                client_thread.start()
-            except Exception as e:
-                logging.error(f"Error accepting connection: {e}")
+        server = await asyncio.start_server(handle_client, HOST, port, backlog=LISTEN_BACKLOG)
     except OSError as e:
         logging.error(f"Failed to bind to {HOST}:{port}. Error: {e}. Is the port already in use?")
-    except KeyboardInterrupt:
-        logging.info("Server shutting down...")
+        return
+    logging.info(f"Server listening on {HOST}:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
     finally:
         logging.info("Closing server socket.")
-        server_socket.close()
+        _db_pool.shutdown(wait=False)
+
+def main(port):
+    init_db()
+    try:
+        asyncio.run(serve(port))
+    except KeyboardInterrupt:
+        logging.info("Server shutting down...")
 
 if __name__ == "__main__":
     if len(sys.argv) != 2: